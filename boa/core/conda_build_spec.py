@@ -66,6 +66,8 @@ class CondaBuildSpec:
         self.raw = ms
         self.splitted = ms.split()
         self.name = self.splitted[0]
+        # name as it appears in variant keys (conda_build_config.yaml)
+        self.vname = self.name.replace("-", "_")
 
         is_pin = False
         if len(self.splitted) > 1:
@@ -75,6 +77,7 @@ class CondaBuildSpec:
         self.is_inherited = is_inherited
         self.is_simple = len(self.splitted) == 1
         self.final = self.raw
+        self._final_split = None
 
         if is_pin:
             is_pin_compatible = self.splitted[1].startswith("PIN_COMPATIBLE")
@@ -100,9 +103,17 @@ class CondaBuildSpec:
     def is_pin_subpackage(self):
         return isinstance(self.pin, PinSubpackage)
 
+    @property
+    def final_split(self):
+        # `final` is reassigned in a few places, so we cache the split per value
+        cached = self._final_split
+        if cached is None or cached[0] is not self.final:
+            cached = self._final_split = (self.final, self.final.split(" ", 1))
+        return cached[1]
+
     @property
     def final_name(self):
-        return self.final.split(" ")[0]
+        return self.final_split[0]
 
     @property
     def final_pin(self):
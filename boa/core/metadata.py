@@ -259,7 +259,7 @@ class MetaData:
         return self.get_value("build/include_recipe", True)
 
     def use_feature_map(self):
-        return self.output.feature_map
+        return self.output.feature_flags
 
     def build_features(self):
         m = self.use_feature_map()
@@ -270,7 +270,7 @@ class MetaData:
             else:
                 return "0"
 
-        return {"FEATURE_" + k.upper(): truefalse(v["activated"]) for k, v in m.items()}
+        return {"FEATURE_" + k.upper(): truefalse(v) for k, v in m.items()}
 
     @property
     def meta_path(self):
@@ -3,6 +3,8 @@
 
 from boa.core.solver import get_solver
 import copy
+import functools
+from itertools import chain
 import json
 from pathlib import Path
 import sys
@@ -23,10 +25,104 @@ from boa.core.config import boa_config
 from boa.core.conda_build_spec import CondaBuildSpec
 from boa.helpers.ast_extract_syms import ast_extract_syms
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 console = boa_config.console
 
 
+_ROW_TPL = " - [white]{name:<30}[/white] [{color}]{version:<20}[/{color}] {fv0:<10} {fv1:<20} {ch}\n"
+_ROW_TPL_NOBUILD = (
+    " - [white]{name:<30}[/white] [{color}]{version:<20}[/{color}] {fv0:<20} {ch}\n"
+)
+_ROW_TPL_TRANSITIVE = " - {name:<51} {fv0:<10} {fv1:<10}\n"
+
+# row color by (from_run_export, from_pinnings, is_pin)
+_COLOR_BY_FLAGS = {
+    (False, False, False): "white",
+    (True, False, False): "blue",
+    (False, True, False): "green",
+    (True, True, False): "green",
+    (False, False, True): "cyan",
+    (True, False, True): "cyan",
+    (False, True, True): "cyan",
+    (True, True, True): "cyan",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_run_exports(path):
+    # run_exports.json files in the package cache do not change during a build,
+    # so we only need to read and parse each of them once (and only keep the
+    # keys we look at)
+    with open(path, "rb") as fi:
+        raw = json_loads(fi.read())
+    return {k: raw.get(k, []) for k in RUN_EXPORTS_TYPES}
+
+
+def _simple_spec_indices(specs):
+    # positions of the simple (unconstrained) specs, by name and in order
+    indices = {}
+    for i, r in enumerate(specs):
+        if r.is_simple:
+            indices.setdefault(r.final_name, []).append(i)
+    return indices
+
+
+def _append_or_replace(specs, indices, spec):
+    # replace the first simple spec with the same name, otherwise append
+    simple = indices.setdefault(spec.name, [])
+    if simple:
+        specs[simple[0]] = spec
+        if not spec.is_simple:
+            simple.pop(0)
+    else:
+        specs.append(spec)
+        if spec.is_simple:
+            simple.append(len(specs) - 1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _channel_name(url, local_root=None):
+    # only a handful of channels show up in a build, no need to re-parse every url
+    if local_root and url.startswith("file://") and local_root in url:
+        return "local"
+    return CondaChannel.from_url(url).name
+
+
 class Output:
+    __slots__ = (
+        "selected_features",
+        "data",
+        "config",
+        "conda_build_config",
+        "name",
+        "version",
+        "build_string",
+        "build_number",
+        "noarch",
+        "is_first",
+        "is_package",
+        "sections",
+        "required_steps",
+        "feature_flags",
+        "_active_feature_reqs",
+        "requirements",
+        "transactions",
+        "parent",
+        "run_exports",
+        "variant",
+        "differentiating_keys",
+        "differentiating_variant",
+        "final_build_id",
+        "parent_steps",
+        "moved_work_dir",
+        "_variant_keys_cache",
+        "_ns_cfg_cache",
+    )
+
     def __init__(
         self, d, config, parent=None, conda_build_config=None, selected_features=None
     ):
@@ -76,49 +172,48 @@ class Output:
 
         self.sections["features"] = parent.get("features", [])
 
-        self.feature_map = {f["name"]: f for f in self.sections.get("features", [])}
-        for fname, feat in self.feature_map.items():
-            activated = feat.get("default", False)
-            if fname in self.selected_features:
-                activated = self.selected_features[fname]
-
-            feat["activated"] = activated
+        self.feature_flags = {}
+        for feat in self.sections["features"]:
+            self.feature_flags[feat["name"]] = self.selected_features.get(
+                feat["name"], feat.get("default", False)
+            )
+        self._active_feature_reqs = [
+            f["requirements"]
+            for f in self.sections["features"]
+            if self.feature_flags[f["name"]] and f.get("requirements")
+        ]
 
-        if self.feature_map.get("static") and self.feature_map["static"]["activated"]:
+        if self.feature_flags.get("static"):
             self.name += "-static"
 
-        if len(self.feature_map):
+        if self.feature_flags and console.is_terminal:
             table = Table()
             table.title = "Activated Features"
             table.add_column("Feature")
             table.add_column("State")
-            for feature in self.feature_map:
-                if self.feature_map[feature]["activated"]:
+            for feature, activated in self.feature_flags.items():
+                if activated:
                     table.add_row(feature, "[green]ON[/green]")
                 else:
                     table.add_row(feature, "[red]OFF[/red]")
 
             console.print(table)
 
-        self.requirements = copy.copy(d.get("requirements", {}))
-        for f in self.feature_map.values():
-            if f["activated"]:
-                if not f.get("requirements"):
-                    continue
-                for i in ["build", "host", "run", "run_constrained"]:
-                    base_req = self.requirements.get(i, [])
-                    feat_req = f["requirements"].get(i, [])
-                    base_req += feat_req
-                    if len(base_req):
-                        self.requirements[i] = base_req
-
         self.transactions = {}
+        self._variant_keys_cache = None
+        self._ns_cfg_cache = None
 
         self.parent = parent
 
+        src = d.get("requirements") or {}
+        self.requirements = {}
         for section in ("build", "host", "run", "run_constrained"):
             self.requirements[section] = [
-                CondaBuildSpec(r) for r in (self.requirements.get(section) or [])
+                CondaBuildSpec(r)
+                for r in chain(
+                    src.get(section) or (),
+                    *(freq.get(section) or () for freq in self._active_feature_reqs),
+                )
             ]
         self.sections["requirements"] = self.requirements
 
@@ -138,12 +233,28 @@ class Output:
                         )
                     ]
 
+    def _selector_namespace(self):
+        # ns_cfg builds a new dict from the config, os.environ and every variant
+        # entry on each call. Reuse it while config and variant are unchanged
+        # (finalize_solve still adds python to the variant between skip() calls).
+        cached = self._ns_cfg_cache
+        if cached and cached[0] is self.config and cached[1] == self.config.variant:
+            return cached[2]
+        ns = ns_cfg(self.config)
+        self._ns_cfg_cache = (self.config, dict(self.config.variant), ns)
+        return ns
+
     def skip(self):
         skips = self.sections["build"].get("skip", [])
-        skip_reasons = []
-        for x in skips:
-            if eval_selector(x, ns_cfg(self.config), []):
-                skip_reasons.append(x)
+        if not skips:
+            return False
+
+        ns = self._selector_namespace()
+        if not console.is_terminal:
+            # the reasons are only printed for interactive use
+            return any(eval_selector(x, ns, []) for x in skips)
+
+        skip_reasons = [x for x in skips if eval_selector(x, ns, [])]
         if len(skip_reasons):
             console.print(
                 f"[green]Skipping {self.name} {' | '.join(self.differentiating_variant)} because of[/green]\n"
@@ -153,98 +264,123 @@ class Output:
 
     def inherit_requirements(self, steps):
         def merge_requirements(a, b):
-            b_names = [x.name for x in b]
+            b_names = {x.name for x in b}
             for r in a:
-                print(r)
                 if r.name in b_names:
                     continue
-                else:
-                    print(r, "is inherited!!!")
 
-                    rc = copy.deepcopy(r)
-                    rc.is_inherited = True
-                    b.append(rc)
+                rc = CondaBuildSpec(r.raw, is_inherited=True)
+                rc.from_pinnings = r.from_pinnings
+                b.append(rc)
+                b_names.add(rc.name)
 
         for s in self.required_steps:
             merge_requirements(
                 steps[s].requirements["build"], self.requirements["build"]
             )
             merge_requirements(steps[s].requirements["host"], self.requirements["host"])
+        self._variant_keys_cache = None
 
     def variant_keys(self):
-        all_keys = self.requirements.get("build", []) + self.requirements.get(
-            "host", []
-        )
-
-        for s in self.sections["build"].get("skip", []):
-            all_keys += ast_extract_syms(s)
+        if self._variant_keys_cache is None:
+            syms = []
+            for s in self.sections["build"].get("skip", []):
+                syms += ast_extract_syms(s)
+
+            self._variant_keys_cache = [
+                str(x)
+                for x in self.requirements.get("build", [])
+                + self.requirements.get("host", [])
+                + syms
+            ]
 
-        return [str(x) for x in all_keys]
+        return self._variant_keys_cache
 
     def all_requirements(self):
-        requirements = (
-            self.requirements.get("build")
-            + self.requirements.get("host")
-            + self.requirements.get("run")
-            + self.run_exports.get("weak")
-            + self.run_exports.get("strong")
-            + self.run_exports.get("noarch")
+        return list(
+            chain(
+                self.requirements.get("build", ()),
+                self.requirements.get("host", ()),
+                self.requirements.get("run", ()),
+                self.run_exports.get("weak", ()),
+                self.run_exports.get("strong", ()),
+                self.run_exports.get("noarch", ()),
+            )
         )
 
-        return requirements
+    def _clone_for_variant(self):
+        # Only copy what gets mutated per variant (requirement specs, run exports,
+        # the recipe data and the transactions). Everything else is shared with
+        # the original output, which is a lot cheaper than a full deepcopy.
+        new = Output.__new__(Output)
+        for attr in Output.__slots__:
+            # attributes like `variant` are not set before apply_variant
+            if hasattr(self, attr):
+                setattr(new, attr, getattr(self, attr))
+        new.data = copy.deepcopy(self.data)
+        new.requirements = {
+            k: [copy.copy(s) for s in v] for k, v in self.requirements.items()
+        }
+        new.run_exports = {
+            k: [copy.copy(s) for s in v] for k, v in self.run_exports.items()
+        }
+        new.sections = {k: copy.copy(v) for k, v in self.sections.items()}
+        new.sections["requirements"] = new.requirements
+        new.transactions = {}
+        new._variant_keys_cache = None
+        new._ns_cfg_cache = None
+        return new
 
     def apply_variant(self, variant, differentiating_keys=()):
-        copied = copy.deepcopy(self)
+        copied = self._clone_for_variant()
 
         copied.variant = variant
-        for idx, r in enumerate(self.requirements["build"]):
-            vname = r.name.replace("-", "_")
-            if vname in variant:
-                copied.requirements["build"][idx] = CondaBuildSpec(
-                    r.name + " " + variant[vname]
-                )
-                copied.requirements["build"][idx].from_pinnings = True
-                copied.requirements["build"][idx].is_inherited = r.is_inherited
-
-        for idx, r in enumerate(self.requirements["host"]):
-            vname = r.name.replace("-", "_")
-            if vname in variant:
-                copied.requirements["host"][idx] = CondaBuildSpec(
-                    r.name + " " + variant[vname]
-                )
-                copied.requirements["host"][idx].from_pinnings = True
-                copied.requirements["host"][idx].is_inherited = r.is_inherited
-
-        # todo figure out if we should pin like that in the run reqs as well?
-        # for idx, r in enumerate(self.requirements["run"]):
-        #     vname = r.name.replace("-", "_")
-        #     if vname in variant:
-        #         copied.requirements["run"][idx] = CondaBuildSpec(
-        #             r.name + " " + variant[vname]
-        #         )
-        #         copied.requirements["run"][idx].from_pinnings = True
+        vget = variant.get
 
-        # insert compiler_cxx, compiler_c and compiler_fortran
+        build_reqs = copied.requirements["build"]
         for idx, r in enumerate(self.requirements["build"]):
+            # insert compiler_cxx, compiler_c and compiler_fortran
             if r.name.startswith("COMPILER_"):
                 lang = r.splitted[1].lower()
-                if variant.get(lang + "_compiler"):
+                if vget(lang + "_compiler"):
                     compiler = (
                         f"{variant[lang + '_compiler']}_{variant['target_platform']}"
                     )
                 else:
                     compiler = f"{native_compiler(lang, copied.config)}_{variant['target_platform']}"
-                if variant.get(lang + "_compiler_version"):
+                if vget(lang + "_compiler_version"):
                     version = variant[lang + "_compiler_version"]
-                    copied.requirements["build"][idx].final = f"{compiler} {version}*"
+                    build_reqs[idx].final = f"{compiler} {version}*"
                 else:
-                    copied.requirements["build"][idx].final = f"{compiler}"
-                copied.requirements["build"][idx].from_pinnings = True
+                    build_reqs[idx].final = f"{compiler}"
+                build_reqs[idx].from_pinnings = True
+                continue
 
-        for r in self.requirements["host"]:
+            v = vget(r.vname)
+            if v is not None:
+                build_reqs[idx] = CondaBuildSpec(r.name + " " + v)
+                build_reqs[idx].from_pinnings = True
+                build_reqs[idx].is_inherited = r.is_inherited
+
+        host_reqs = copied.requirements["host"]
+        for idx, r in enumerate(self.requirements["host"]):
             if r.name.startswith("COMPILER_"):
                 raise RuntimeError("Compiler should be in build section")
 
+            v = vget(r.vname)
+            if v is not None:
+                host_reqs[idx] = CondaBuildSpec(r.name + " " + v)
+                host_reqs[idx].from_pinnings = True
+                host_reqs[idx].is_inherited = r.is_inherited
+
+        # todo figure out if we should pin like that in the run reqs as well?
+        # for idx, r in enumerate(self.requirements["run"]):
+        #     if r.vname in variant:
+        #         copied.requirements["run"][idx] = CondaBuildSpec(
+        #             r.name + " " + variant[r.vname]
+        #         )
+        #         copied.requirements["run"][idx].from_pinnings = True
+
         copied.config = get_or_merge_config(self.config, variant=variant)
 
         copied.differentiating_keys = differentiating_keys
@@ -312,38 +448,23 @@ class Output:
         table.add_column("Channel")
 
         def spec_format(x):
-            version, fv = " ", " "
-            channel = CondaChannel.from_url(x.channel).name
-
-            if (
-                x.channel.startswith("file://")
-                and context.local_build_root in x.channel
-            ):
-                channel = "local"
-
-            if len(x.final.split(" ")) > 1:
-                version = " ".join(r.final.split(" ")[1:])
-            if hasattr(x, "final_version"):
-                fv = x.final_version
-            color = "white"
-            if x.from_run_export:
-                color = "blue"
-            if x.from_pinnings:
-                color = "green"
+            parts = x.final_split
+            name = parts[0]
+            version = parts[1] if len(parts) > 1 else " "
+            fv = getattr(x, "final_version", " ")
+            channel = _channel_name(x.channel, context.local_build_root)
+
             if x.is_transitive_dependency:
-                table.add_row(
-                    f"{r.final_name}", "", f"{fv[0]}", f"{fv[1]}", f"{channel}"
-                )
+                table.add_row(f"{name}", "", f"{fv[0]}", f"{fv[1]}", f"{channel}")
                 return
 
+            color = _COLOR_BY_FLAGS[(x.from_run_export, x.from_pinnings, x.is_pin)]
             if x.is_pin:
                 if x.is_pin_compatible:
                     version = "PC " + version
                 else:
                     version = "PS " + version
-                color = "cyan"
 
-            name = r.final_name
             if x.is_inherited:
                 name += " (inherited)"
                 color = "magenta"
@@ -372,22 +493,16 @@ class Output:
                 table.add_row(pns, pns, pns, pns, pns)
             table.add_row(Padding(header, (0, 0), style="bold yellow"), p, p, p, p)
 
-        if self.requirements["build"]:
-            add_header("Build")
-            for r in self.requirements["build"]:
-                spec_format(r)
-        if self.requirements["host"]:
-            add_header("Host", True)
-            for r in self.requirements["host"]:
-                spec_format(r)
-        if self.requirements["run"]:
-            add_header("Run", True)
-            for r in self.requirements["run"]:
-                spec_format(r)
-        if self.requirements["run_constrained"]:
-            add_header("Run Constraints", True)
-            for r in self.requirements["run_constrained"]:
-                spec_format(r)
+        for env, header in (
+            ("build", "Build"),
+            ("host", "Host"),
+            ("run", "Run"),
+            ("run_constrained", "Run Constraints"),
+        ):
+            if self.requirements[env]:
+                add_header(header, env != "build")
+                for x in self.requirements[env]:
+                    spec_format(x)
         return table
 
     def __repr__(self):
@@ -398,50 +513,48 @@ class Output:
         s += "Build:\n"
 
         def spec_format(x):
-            version, fv = " ", " "
-            if len(x.final.split(" ")) > 1:
-                version = " ".join(r.final.split(" ")[1:])
-            if hasattr(x, "final_version"):
-                fv = x.final_version
-            color = "white"
-            if x.from_run_export:
-                color = "blue"
-            if x.from_pinnings:
-                color = "green"
+            parts = x.final_split
+            name = parts[0]
+            fv = getattr(x, "final_version", " ")
             if x.is_transitive_dependency:
-                return f" - {r.final_name:<51} {fv[0]:<10} {fv[1]:<10}\n"
+                return _ROW_TPL_TRANSITIVE.format(name=name, fv0=fv[0], fv1=fv[1])
+            version = parts[1] if len(parts) > 1 else " "
             if x.is_pin:
-                if x.is_pin_compatible:
-                    version = "PC " + version
-                else:
-                    version = "PS " + version
-                color = "cyan"
-
-            channel = CondaChannel.from_url(x.channel).name
-
+                version = ("PC " if x.is_pin_compatible else "PS ") + version
+
+            fields = {
+                "name": name,
+                "color": _COLOR_BY_FLAGS[
+                    (x.from_run_export, x.from_pinnings, x.is_pin)
+                ],
+                "version": version,
+                "fv0": fv[0],
+                "ch": _channel_name(x.channel),
+            }
             if len(fv) >= 2:
-                return f" - [white]{r.final_name:<30}[/white] [{color}]{version:<20}[/{color}] {fv[0]:<10} {fv[1]:<20} {channel}\n"
+                fields["fv1"] = fv[1]
+                return _ROW_TPL.format_map(fields)
             else:
-                return f" - [white]{r.final_name:<30}[/white] [{color}]{version:<20}[/{color}] {fv[0]:<20} {channel}\n"
-
-        for r in self.requirements["build"]:
-            s += spec_format(r)
-        s += "Host:\n"
-        for r in self.requirements["host"]:
-            s += spec_format(r)
-        s += "Run:\n"
-        for r in self.requirements["run"]:
-            s += spec_format(r)
+                return _ROW_TPL_NOBUILD.format_map(fields)
+
+        for env, header in (("build", None), ("host", "Host"), ("run", "Run")):
+            if header:
+                s += f"{header}:\n"
+            for x in self.requirements[env]:
+                s += spec_format(x)
         return s
 
     def propagate_run_exports(self, env, pkg_cache):
         # find all run exports
         collected_run_exports = []
         config_pins = self.conda_build_config.get("pin_run_as_build", {})
+        ignore_run_exports = frozenset(
+            self.sections["build"].get("ignore_run_exports") or ()
+        )
         for s in self.requirements[env]:
             if s.is_transitive_dependency:
                 continue
-            if s.name in self.sections["build"].get("ignore_run_exports", []):
+            if s.name in ignore_run_exports:
                 continue
 
             if hasattr(s, "final_version"):
@@ -450,10 +563,10 @@ class Output:
                 console.print(f"[red]{s} has no final version")
                 continue
 
-            if s.name.replace("-", "_") in config_pins:
+            if s.vname in config_pins:
                 s.run_exports_info = {
                     "weak": [
-                        f"{s.final_name} {apply_pin_expressions(s.final_version[0], **config_pins[s.name.replace('-', '_')])}"
+                        f"{s.final_name} {apply_pin_expressions(s.final_version[0], **config_pins[s.vname])}"
                     ]
                 }
                 collected_run_exports.append(s.run_exports_info)
@@ -464,22 +577,22 @@ class Output:
                     "run_exports.json",
                 )
                 if path.exists():
-                    with open(path) as fi:
-                        run_exports_info = json.load(fi)
-                        s.run_exports_info = run_exports_info
-                        collected_run_exports.append(run_exports_info)
+                    run_exports_info = _load_run_exports(str(path))
+                    s.run_exports_info = run_exports_info
+                    collected_run_exports.append(run_exports_info)
                 else:
                     s.run_exports_info = None
 
+        # positions of the simple specs per name, built lazily for each env
+        name_indices = {}
+
         def append_or_replace(env, spec):
             spec = CondaBuildSpec(spec)
-            name = spec.name
             spec.from_run_export = True
-            for idx, r in enumerate(self.requirements[env]):
-                if r.final_name == name and r.is_simple:
-                    self.requirements[env][idx] = spec
-                    return
-            self.requirements[env].append(spec)
+            reqs = self.requirements[env]
+            if env not in name_indices:
+                name_indices[env] = _simple_spec_indices(reqs)
+            _append_or_replace(reqs, name_indices[env], spec)
 
         if env == "build":
             for rex in collected_run_exports:
@@ -512,6 +625,7 @@ class Output:
             console.print(f"Finalizing [yellow]{env}[/yellow] for {self.name}")
             specs = self.requirements[env]
 
+            final_specs, spec_strs, spec_map = [], [], {}
             for s in specs:
                 if s.is_pin_subpackage:
                     s.eval_pin_subpackage(all_outputs)
@@ -519,12 +633,13 @@ class Output:
                     s.eval_pin_compatible(
                         self.requirements["build"], self.requirements["host"]
                     )
+                # note: str() loosens the spec, so record the final spec first
+                final_specs.append(s.final)
+                spec_map[s.final_name] = s
+                spec_strs.append(str(s))
 
             # save finalized requirements in data for usage in metadata
-            self.data["requirements"][env] = [s.final for s in self.requirements[env]]
-
-            spec_map = {s.final_name: s for s in specs}
-            specs = [str(x) for x in specs]
+            self.data["requirements"][env] = final_specs
 
             if env in ("host", "run") and not self.config.subdirs_same:
                 subdir = self.config.host_subdir
@@ -540,11 +655,11 @@ class Output:
             elif env == "build":
                 MambaContext().target_prefix = self.config.build_prefix
                 # solver.replace_installed(self.config.build_prefix)
-            t = solver.solve(specs, [pkg_cache])
+            t = solver.solve_cached(spec_strs, [pkg_cache])
 
             _, install_pkgs, _ = t.to_conda()
-            for _, _, p in install_pkgs:
-                p = json.loads(p)
+            for _, _, raw in install_pkgs:
+                p = json_loads(raw)
                 if p["name"] in spec_map:
                     spec_map[p["name"]].final_version = (
                         p["version"],
@@ -1,6 +1,7 @@
 # Copyright (C) 2021, QuantStack
 # SPDX-License-Identifier: BSD-3-Clause
 
+import hashlib
 import os
 import tempfile
 
@@ -51,6 +52,11 @@ def get_solver(subdir, output_folder="local"):
     return solver_cache[subdir], pkg_cache
 
 
+def _file_digest(path):
+    with open(path, "rb") as fi:
+        return hashlib.sha1(fi.read()).hexdigest()
+
+
 def get_url_from_channel(c):
     if c.startswith("file://"):
         # The conda functions (specifically remove_auth) assume the input
@@ -136,6 +142,9 @@ class MambaSolver:
 
         self.local_index = []
         self.local_repos = {}
+        self.local_state = None
+        # solved libmambapy.Solvers by specs, see `solve_cached`
+        self.solve_cache = {}
         # load local repo, too
         self.replace_channels()
 
@@ -148,15 +157,11 @@ class MambaSolver:
         repo.set_installed()
 
     def replace_channels(self):
-        console.print(f"[blue]Reloading output folder: {self.output_folder}")
         self.local_index = get_index(
             (self.output_folder,), platform=self.platform, prepend=False
         )
 
-        for _, v in self.local_repos.items():
-            v.clear(True)
-
-        start_prio = len(self.channels) + len(self.index)
+        local_channels = []
         for subdir, channel in self.local_index:
             if not subdir.loaded():
                 continue
@@ -174,6 +179,22 @@ class MambaSolver:
                 os.remove(subdir.cache_path())
                 cp = cp.replace(".solv", ".json")
 
+            local_channels.append((channelstr, channelurl, cp))
+
+        # If the local repodata did not change (e.g. nothing was built since the
+        # last reload) we keep the pool as it is, and with it the cached solves.
+        local_state = tuple((c, _file_digest(cp)) for c, _, cp in local_channels)
+        if local_state == self.local_state:
+            return
+        console.print(f"[blue]Reloading output folder: {self.output_folder}")
+        self.local_state = local_state
+        self.solve_cache.clear()
+
+        for _, v in self.local_repos.items():
+            v.clear(True)
+
+        start_prio = len(self.channels) + len(self.index)
+        for channelstr, channelurl, cp in local_channels:
             self.local_repos[channelstr] = libmambapy.Repo(
                 self.pool, channelstr, cp, channelurl
             )
@@ -181,23 +202,7 @@ class MambaSolver:
             self.local_repos[channelstr].set_priority(start_prio, 0)
             start_prio -= 1
 
-    def solve(self, specs, pkg_cache_path=None):
-        """Solve given a set of specs.
-        Parameters
-        ----------
-        specs : list of str
-            A list of package specs. You can use `conda.models.match_spec.MatchSpec`
-            to get them to the right form by calling
-            `MatchSpec(mypec).conda_build_form()`
-        Returns
-        -------
-        transaction : libmambapy.Transaction
-            The mamba transaction.
-        Raises
-        ------
-        RuntimeError :
-            If the solver did not find a solution.
-        """
+    def _solve_jobs(self, specs):
         solver_options = [(libmambapy.SOLVER_FLAG_ALLOW_DOWNGRADE, 1)]
         api_solver = libmambapy.Solver(self.pool, solver_options)
         _specs = specs
@@ -219,6 +224,9 @@ class MambaSolver:
             print(error_string)
             raise RuntimeError("Solver could not find solution." + error_string)
 
+        return api_solver
+
+    def _transaction(self, api_solver, pkg_cache_path):
         if pkg_cache_path is None:
             # use values from conda
             pkg_cache_path = pkgs_dirs
@@ -226,6 +234,35 @@ class MambaSolver:
         package_cache = libmambapy.MultiPackageCache(pkg_cache_path)
         return libmambapy.Transaction(api_solver, package_cache)
 
+    def solve(self, specs, pkg_cache_path=None):
+        """Solve given a set of specs.
+        Parameters
+        ----------
+        specs : list of str
+            A list of package specs. You can use `conda.models.match_spec.MatchSpec`
+            to get them to the right form by calling
+            `MatchSpec(mypec).conda_build_form()`
+        Returns
+        -------
+        transaction : libmambapy.Transaction
+            The mamba transaction.
+        Raises
+        ------
+        RuntimeError :
+            If the solver did not find a solution.
+        """
+        return self._transaction(self._solve_jobs(specs), pkg_cache_path)
+
+    def solve_cached(self, specs, pkg_cache_path=None):
+        """Same as `solve`, but reuses the solver of an earlier call with the same
+        specs for as long as the local channels did not change (see
+        `replace_channels`). Every call still returns a new transaction.
+        """
+        key = tuple(sorted(specs))
+        if key not in self.solve_cache:
+            self.solve_cache[key] = self._solve_jobs(specs)
+        return self._transaction(self.solve_cache[key], pkg_cache_path)
+
     def solve_for_action(self, specs, prefix):
         t = self.solve(specs)
         if not boa_config.quiet and not boa_config.is_mambabuild:
@@ -0,0 +1,19 @@
+from boa.core.conda_build_spec import CondaBuildSpec
+
+
+def test_final_split():
+    spec = CondaBuildSpec("numpy >=1.20 py39*")
+    assert spec.final_split == ["numpy", ">=1.20 py39*"]
+    assert spec.final_name == "numpy"
+
+    assert CondaBuildSpec("zlib").final_split == ["zlib"]
+
+    # the cached split follows changes to `final`
+    spec.final = "numpy-base 1.21"
+    assert spec.final_split == ["numpy-base", "1.21"]
+    assert spec.final_name == "numpy-base"
+
+    spec = CondaBuildSpec("python 3.9")
+    assert spec.final_split == ["python", "3.9"]
+    spec.loosen_spec()
+    assert spec.final_split == ["python", "3.9.*"]
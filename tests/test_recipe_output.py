@@ -0,0 +1,94 @@
+from conda_build.config import Config
+
+from boa.core.conda_build_spec import CondaBuildSpec
+from boa.core.recipe_output import Output, _append_or_replace, _simple_spec_indices
+
+
+def specs(*names):
+    return [CondaBuildSpec(x) for x in names]
+
+
+def test_append_or_replace():
+    reqs = specs("python", "numpy >=1.20", "zlib")
+    indices = _simple_spec_indices(reqs)
+    assert indices == {"python": [0], "zlib": [2]}
+
+    # a simple spec gets replaced
+    _append_or_replace(reqs, indices, CondaBuildSpec("zlib >=1.2.11,<1.3"))
+    assert [r.final for r in reqs] == ["python", "numpy >=1.20", "zlib >=1.2.11,<1.3"]
+
+    # constrained specs are never replaced
+    _append_or_replace(reqs, indices, CondaBuildSpec("numpy >=1.21"))
+    _append_or_replace(reqs, indices, CondaBuildSpec("zlib >=1.2.12"))
+    assert [r.final for r in reqs] == [
+        "python",
+        "numpy >=1.20",
+        "zlib >=1.2.11,<1.3",
+        "numpy >=1.21",
+        "zlib >=1.2.12",
+    ]
+
+    # an appended simple spec can be replaced later on
+    _append_or_replace(reqs, indices, CondaBuildSpec("libcxx"))
+    _append_or_replace(reqs, indices, CondaBuildSpec("libcxx >=14"))
+    assert reqs[-1].final == "libcxx >=14"
+    assert len(reqs) == 6
+
+
+def test_append_or_replace_duplicates():
+    reqs = specs("zlib", "python", "zlib")
+    indices = _simple_spec_indices(reqs)
+
+    _append_or_replace(reqs, indices, CondaBuildSpec("zlib >=1.2.11"))
+    assert [r.final for r in reqs] == ["zlib >=1.2.11", "python", "zlib"]
+
+    # the next simple duplicate is replaced, not appended
+    _append_or_replace(reqs, indices, CondaBuildSpec("zlib <1.3"))
+    assert [r.final for r in reqs] == ["zlib >=1.2.11", "python", "zlib <1.3"]
+
+    _append_or_replace(reqs, indices, CondaBuildSpec("zlib <2"))
+    assert [r.final for r in reqs] == [
+        "zlib >=1.2.11",
+        "python",
+        "zlib <1.3",
+        "zlib <2",
+    ]
+
+
+def test_apply_variant_copies():
+    d = {
+        "step": {"name": "foo"},
+        "package": {"name": "foo", "version": "1.0"},
+        "build": {"run_exports": ["foo"]},
+        "requirements": {
+            "build": ["COMPILER_CXX cxx", "cmake"],
+            "host": ["python"],
+            "run": ["python"],
+        },
+    }
+    output = Output(d, Config())
+    variant = {"target_platform": "linux-64", "cxx_compiler": "gxx"}
+    a = output.apply_variant({**variant, "python": "3.9"}, ["python"])
+    b = output.apply_variant({**variant, "python": "3.10"}, ["python"])
+
+    # mutate the first variant like finalizing and building it does
+    a.requirements["host"][0].final = "python 3.9.1"
+    a.requirements["build"][1].from_pinnings = True
+    a.run_exports["weak"][:] = []
+    a.sections["package"]["name"] = "foo-changed"
+    a.data["build"]["run_exports"] = None
+
+    assert [r.final for r in output.requirements["host"]] == ["python"]
+    assert [r.final for r in b.requirements["host"]] == ["python 3.10"]
+    for o in (output, b):
+        assert o.requirements["build"][1].from_pinnings is False
+        assert [r.final for r in o.run_exports["weak"]] == ["foo"]
+        assert o.sections["package"]["name"] == "foo"
+        assert o.data["build"]["run_exports"] == ["foo"]
+        assert o.sections["requirements"] is o.requirements
+
+    assert [r.final for r in b.requirements["build"]] == ["gxx_linux-64", "cmake"]
+    assert [r.final for r in output.requirements["build"]] == [
+        "COMPILER_CXX cxx",
+        "cmake",
+    ]
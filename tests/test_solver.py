@@ -0,0 +1,101 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from boa.core import solver
+
+
+class FakeSubdir:
+    def __init__(self, path):
+        self.path = path
+
+    def loaded(self):
+        return True
+
+    def cache_path(self):
+        return str(self.path)
+
+
+class FakeRepo:
+    created = []
+
+    def __init__(self, pool, name, path, url):
+        self.name = name
+        self.cleared = False
+        FakeRepo.created.append(self)
+
+    def set_installed(self):
+        pass
+
+    def clear(self, reuse_ids):
+        self.cleared = True
+
+    def set_priority(self, priority, subpriority):
+        pass
+
+
+def local_repos():
+    return [r for r in FakeRepo.created if r.name != "installed"]
+
+
+def make_solver(monkeypatch, tmp_path: Path, repodata: Path):
+    local_channel = {"url": "file:///output-folder"}
+    monkeypatch.setattr(
+        solver,
+        "get_index",
+        lambda *args, **kwargs: [(FakeSubdir(repodata), local_channel)],
+    )
+    # skip loading the remote channels and virtual packages
+    monkeypatch.setattr(solver, "load_channels", lambda *args, **kwargs: [])
+    installed = SimpleNamespace(name=str(tmp_path / "installed.json"))
+    monkeypatch.setattr(solver, "get_virtual_packages", lambda: installed)
+    monkeypatch.setattr(solver.libmambapy, "Pool", lambda: None)
+    monkeypatch.setattr(solver.libmambapy, "Repo", FakeRepo)
+    FakeRepo.created = []
+
+    return solver.MambaSolver([], "linux-64", "output-folder")
+
+
+def test_replace_channels_keeps_unchanged_repodata(tmp_path: Path, monkeypatch):
+    repodata = tmp_path / "repodata.json"
+    repodata.write_text('{"packages": {}}')
+    s = make_solver(monkeypatch, tmp_path, repodata)
+    assert len(local_repos()) == 1
+    s.solve_cache["specs"] = "solved"
+
+    # nothing changed: pool and solves are kept
+    s.replace_channels()
+    assert len(local_repos()) == 1
+    assert not local_repos()[0].cleared
+    assert s.solve_cache == {"specs": "solved"}
+
+    # a new package was added to the local channel
+    repodata.write_text('{"packages": {"a-1.0-0.tar.bz2": {}}}')
+    s.replace_channels()
+    assert len(local_repos()) == 2
+    assert local_repos()[0].cleared
+    assert s.solve_cache == {}
+
+
+def test_solve_cached(tmp_path: Path, monkeypatch):
+    repodata = tmp_path / "repodata.json"
+    repodata.write_text('{"packages": {}}')
+    s = make_solver(monkeypatch, tmp_path, repodata)
+
+    solves = []
+
+    def solve_jobs(specs):
+        solves.append(specs)
+        return object()
+
+    monkeypatch.setattr(s, "_solve_jobs", solve_jobs)
+    monkeypatch.setattr(s, "_transaction", lambda api_solver, _: (api_solver, object()))
+
+    solver_a, transaction_a = s.solve_cached(["python", "numpy"], ["pkgs"])
+    solver_b, transaction_b = s.solve_cached(["numpy", "python"], ["pkgs"])
+    assert len(solves) == 1
+    assert solver_a is solver_b
+    # every caller gets its own transaction
+    assert transaction_a is not transaction_b
+
+    s.solve_cached(["python"], ["pkgs"])
+    assert len(solves) == 2